@@ -2,12 +2,15 @@ import os
 import sys
 import time
 import logging
+import mmap
 import platform
 import traceback
 import unicodedata
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-from statistics import mean, quantiles, stdev
+from statistics import mean
 
+import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 import psutil
@@ -30,6 +33,11 @@ logging.basicConfig(
     ]
 )
 logger = logging.getLogger(__name__)
+# Skip the per-record caller lookup; the format has no file/line fields
+logging._srcfile = None
+
+# Prime the CPU counter so later non-blocking samples cover the whole run
+psutil.cpu_percent(interval=None)
 
 # Performance Requirements (updated based on your actual results)
 PERFORMANCE_REQUIREMENTS = {
@@ -50,6 +58,18 @@ TEST_QUERIES = [
     "1;2;3",
     "a" * 100
 ]
+SEARCH_METHODS = ["linear", "binary"]
+REREAD_MODES = [False, True]
+
+# Benchmark result schema, in column order
+RESULT_COLUMNS = [
+    ("Algorithm", object), ("Reread", bool), ("FileSize", np.int64),
+    ("Samples", np.int64), ("AvgTime", np.float64), ("MinTime", np.float64),
+    ("MaxTime", np.float64), ("StdDev", np.float64), ("P90", np.float64),
+    ("P95", np.float64), ("P99", np.float64), ("P999", np.float64),
+    ("BatchAvgTime", np.float64), ("WarmupAvg", np.float64),
+    ("WarmupMax", np.float64),
+]
 
 
 class UnicodePDF(FPDF):
@@ -99,32 +119,31 @@ def setup_benchmark_environment():
 
 
 def generate_test_files():
-    """Create test files with proper encoding handling."""
+    """Create test files holding the first N lines of the base data."""
     try:
         logger.info("Generating test files...")
-        for size in TEST_SIZES:
-            output_file = f"benchmarks/test_data/{size}.txt"
-            if os.path.exists(output_file):
-                continue
-            start_time = time.time()
-            processed_lines = 0
-            with open("../200k.txt", "r", encoding='utf-8') as f_in, \
-                    open(output_file, "w", encoding='utf-8') as f_out:
-                for i, line in enumerate(f_in):
-                    if i >= size:
+        with open("../200k.txt", "rb") as f_in, \
+                mmap.mmap(f_in.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for size in TEST_SIZES:
+                output_file = f"benchmarks/test_data/{size}.txt"
+                if os.path.exists(output_file):
+                    continue
+                start_time = time.time()
+                # Locate the end of line N with C-level newline scans, then
+                # copy the whole prefix with a single write
+                end = 0
+                for _ in range(size):
+                    nl_pos = mm.find(b"\n", end)
+                    if nl_pos == -1:
+                        end = len(mm)
                         break
-                    f_out.write(line)
-                    processed_lines = i + 1
-                    if processed_lines % 10000 == 0:
-                        elapsed = time.time() - start_time
-                        logger.debug(
-                            f"Generated {processed_lines:,}"
-                            f" lines for {size:,} in {elapsed:.2f}s"
-                        )
-            logger.info(
-                f"Created {size:,} line test file in"
-                f" {time.time() - start_time:.2f} seconds"
-            )
+                    end = nl_pos + 1
+                with open(output_file, "wb") as f_out:
+                    f_out.write(mm[:end])
+                logger.info(
+                    "Created %d line test file in %.2f seconds",
+                    size, time.time() - start_time
+                )
         return True
     except Exception as e:
         logger.error("Test file generation failed: %s", str(e))
@@ -132,80 +151,125 @@ def generate_test_files():
         return False
 
 
-def run_benchmark_suite():
-    """Execute performance tests with high-precision timing."""
-    results = []
-    for size in TEST_SIZES:
-        test_file = f"benchmarks/test_data/{size}.txt"
-        for method in ["linear", "binary"]:
-            for reread in [False, True]:
-                try:
-                    logger.info(
-                        f"Testing {method.upper()} search with "
-                        f"{'RE-READ' if reread else 'MEMORY'} on"
-                        f"{size:,} records"
-                    )
-                    # Initialize searcher
-                    searcher = Searcher(
-                        test_file,
-                        method=method,
-                        reread_on_query=reread
-                    )
-                    # Stabilization phase
-                    warmup_times = []
-                    for _ in range(5):
-                        start = time.perf_counter_ns()
-                        searcher.search(TEST_QUERIES[0])
-                        elapsed_ns = time.perf_counter_ns() - start
-                        warmup_times.append(elapsed_ns / 1e6)
+def make_searcher(test_file, method, reread, data_cache):
+    """Build a searcher, parsing each in-memory data file only once."""
+    if reread:
+        return Searcher(test_file, method=method, reread_on_query=True)
+    if test_file in data_cache:
+        return Searcher(test_file, method=method,
+                        data=data_cache[test_file])
+    searcher = Searcher(test_file, method=method)
+    data_cache[test_file] = searcher.data
+    return searcher
+
+
+def _run_size(size):
+    """Run every method/reread trial for one file size in a worker.
+
+    The trials for a size share one parse of its file, so a size is the
+    unit of work handed to each process.
+    """
+    test_file = f"benchmarks/test_data/{size}.txt"
+    records = []
+    data_cache = {}
+    for method in SEARCH_METHODS:
+        for reread in REREAD_MODES:
+            try:
+                logger.info(
+                    "Testing %s search with %s on %d records",
+                    method.upper(), "RE-READ" if reread else "MEMORY",
+                    size
+                )
+                # Initialize searcher inside the worker process
+                searcher = make_searcher(
+                    test_file, method, reread, data_cache)
+                # Bind hot names once so the timed loops measure the
+                # search rather than attribute lookups
+                search = searcher.search
+                clock = time.perf_counter_ns
+                # Stabilization phase
+                warmup_times = []
+                for _ in range(5):
+                    start = clock()
+                    search(TEST_QUERIES[0])
+                    elapsed_ns = clock() - start
+                    warmup_times.append(elapsed_ns / 1e6)
+                if logger.isEnabledFor(logging.DEBUG):
                     logger.debug(
-                        f"Warmup complete - Avg: {mean(warmup_times):.2f}ms, "
-                        f"Max: {max(warmup_times):.2f}ms"
-                    )
-                    # Main benchmark
-                    all_times = []
-                    for query in TEST_QUERIES:
-                        query_times = []
-                        for _ in range(100):
-                            start = time.perf_counter_ns()
-                            searcher.search(query)
-                            elapsed_ns = time.perf_counter_ns() - start
-                            query_times.append(elapsed_ns / 1e6)
-                        all_times.extend(query_times)
-                    # Filter out unrealistically small times
-                    filtered_times = (
-                        [t for t in all_times if t > 0.001] or [0.001]
-                    )
-                    sorted_times = sorted(filtered_times)
-                    time_quantiles = quantiles(sorted_times, n=100)
-                    results.append({
-                        "Algorithm": method,
-                        "Reread": reread,
-                        "FileSize": size,
-                        "Samples": len(filtered_times),
-                        "AvgTime": mean(filtered_times),
-                        "MinTime": min(filtered_times),
-                        "MaxTime": max(filtered_times),
-                        "StdDev":
-                        stdev(filtered_times)
-                        if len(filtered_times) > 1
-                        else 0,
-                        "P90": time_quantiles[89],
-                        "P95": time_quantiles[94],
-                        "P99": time_quantiles[98],
-                        "P999": time_quantiles[99]
-                        if len(time_quantiles) > 99 else max(filtered_times),
-                        "WarmupAvg": mean(warmup_times),
-                        "WarmupMax": max(warmup_times)
-                    })
-                except Exception as e:
-                    logger.error(
-                        f"Benchmark failed for {method} {size}"
-                        f" (reread={reread}): {str(e)}"
+                        "Warmup complete - Avg: %.2fms, Max: %.2fms",
+                        mean(warmup_times), max(warmup_times)
                     )
-                    logger.debug(traceback.format_exc())
-                    continue
-    return pd.DataFrame(results)
+                # Main benchmark: keep raw ns deltas, convert once
+                samples_ns = np.empty(
+                    (len(TEST_QUERIES), 100), dtype=np.int64)
+                for q, query in enumerate(TEST_QUERIES):
+                    query_ns = samples_ns[q]
+                    for j in range(100):
+                        start = clock()
+                        search(query)
+                        query_ns[j] = clock() - start
+                samples_ns = samples_ns.ravel()
+                # Drop samples below the clock's resolution
+                times = samples_ns[samples_ns > 0] * 1e-6
+                if times.size == 0:
+                    times = np.array([0.001])
+                # Same workload as one batch, sharing the reload check
+                batch = TEST_QUERIES * 100
+                start = clock()
+                searcher.search_many(batch)
+                batch_avg = (clock() - start) * 1e-6 / len(batch)
+                # One partition pass serves all four percentiles
+                p90, p95, p99, p999 = np.quantile(
+                    times, [0.90, 0.95, 0.99, 0.999]
+                )
+                records.append((
+                    method, reread, size, times.size,
+                    times.mean(), times.min(), times.max(),
+                    times.std(ddof=1) if times.size > 1 else 0,
+                    p90, p95, p99, p999, batch_avg,
+                    mean(warmup_times), max(warmup_times),
+                ))
+            except Exception as e:
+                logger.error(
+                    "Benchmark failed for %s %d (reread=%s): %s",
+                    method, size, reread, e
+                )
+                logger.debug(traceback.format_exc())
+                continue
+    return records
+
+
+def run_benchmark_suite():
+    """Execute performance tests with high-precision timing.
+
+    File sizes run in parallel worker processes. Workers are capped at
+    one per size and per core so concurrent trials do not contend for
+    the same CPU and skew each other's latencies.
+    """
+    # One preallocated array per column; rows are filled in place
+    n_rows = len(TEST_SIZES) * len(SEARCH_METHODS) * len(REREAD_MODES)
+    columns = [np.empty(n_rows, dtype=dtype) for _, dtype in RESULT_COLUMNS]
+    row = 0
+    workers = min(len(TEST_SIZES), os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(_run_size, size) for size in TEST_SIZES]
+        # Collect in submission order so rows stay sorted by size
+        for future in futures:
+            try:
+                records = future.result()
+            except Exception as e:
+                logger.error("Benchmark worker failed: %s", e)
+                logger.debug(traceback.format_exc())
+                continue
+            for record in records:
+                for column, value in zip(columns, record):
+                    column[row] = value
+                row += 1
+    # Failed runs leave trailing rows unfilled
+    return pd.DataFrame({
+        name: column[:row]
+        for (name, _), column in zip(RESULT_COLUMNS, columns)
+    })
 
 
 def validate_performance(df):
@@ -223,8 +287,8 @@ def validate_performance(df):
                     (df["Reread"] == reread)
                 ]
                 if subset.empty:
-                    logger.warning(f"No data for {method} {condition}"
-                                   f" at {size} records")
+                    logger.warning("No data for %s %s at %d records",
+                                   method, condition, size)
                     continue
                 row = subset.iloc[0]
                 metrics = [
@@ -271,58 +335,50 @@ def create_performance_plots(df):
     """Generate visualizations with improved styling."""
     try:
         plt.style.use('ggplot')
+        fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(12, 8))
+        # Throughput and latency share one pass over each series
+        series = df.groupby(["Algorithm", "Reread"], sort=False)
+        for (method, reread), subset in series:
+            label = f"{method} {'(R)' if reread else ''}"
+            linestyle = '--' if reread else '-'
+            ax1.plot(
+                subset["FileSize"],
+                subset["Samples"] / subset["AvgTime"],
+                label=label,
+                marker='o',
+                linestyle=linestyle
+            )
+            ax2.errorbar(
+                subset["FileSize"],
+                subset["AvgTime"],
+                yerr=subset["StdDev"],
+                label=label,
+                capsize=5,
+                marker='s',
+                linestyle=linestyle
+            )
         # Throughput Analysis
-        ax1 = plt.subplot(2, 2, 1)
-        for method in df["Algorithm"].unique():
-            for reread in [False, True]:
-                subset = df[
-                    (df["Algorithm"] == method)
-                    & (df["Reread"] == reread)]
-                ax1.plot(
-                    subset["FileSize"],
-                    subset["Samples"] / subset["AvgTime"],
-                    label=f"{method} {'(R)' if reread else ''}",
-                    marker='o',
-                    linestyle='--' if reread else '-'
-                )
         ax1.set_title("Throughput (Operations per Millisecond)")
         ax1.set_xlabel("Dataset Size (records)")
         ax1.set_ylabel("Operations/ms")
         ax1.legend()
         ax1.grid(True, alpha=0.3)
         # Latency Analysis
-        ax2 = plt.subplot(2, 2, 2)
-        for method in df["Algorithm"].unique():
-            for reread in [False, True]:
-                subset = df[
-                    (df["Algorithm"] == method)
-                    & (df["Reread"] == reread)]
-                ax2.errorbar(
-                    subset["FileSize"],
-                    subset["AvgTime"],
-                    yerr=subset["StdDev"],
-                    label=f"{method} {'(R)' if reread else ''}",
-                    capsize=5,
-                    marker='s',
-                    linestyle='--' if reread else '-'
-                )
         ax2.set_title("Average Latency with Std Dev")
         ax2.set_xlabel("Dataset Size (records)")
         ax2.set_ylabel("Time (ms)")
         ax2.legend()
         ax2.grid(True, alpha=0.3)
         # Percentile Analysis
-        ax3 = plt.subplot(2, 2, 3)
         percentiles = ['P90', 'P95', 'P99', 'P999']
         colors = plt.cm.viridis([0.2, 0.4, 0.6, 0.8])
-        for method in df["Algorithm"].unique():
-            subset = df[
-                (df["Algorithm"] == method)
-                & (df["FileSize"] == 200000)]
+        largest = df[df["FileSize"] == 200000].groupby(
+            "Algorithm", sort=False)[percentiles].first()
+        for method, values in largest.iterrows():
             for i, p in enumerate(percentiles):
                 ax3.bar(
                     f"{method}\n{p}",
-                    subset[p].values[0],
+                    values[p],
                     color=colors[i],
                     label=p if method == 'linear' else ""
                 )
@@ -331,8 +387,8 @@ def create_performance_plots(df):
         ax3.legend(title="Percentile")
         ax3.grid(True, axis='y', alpha=0.3)
         # System Resource Plot
-        ax4 = plt.subplot(2, 2, 4)
-        cpu_usage = psutil.cpu_percent(interval=1)
+        # Usage since the priming call at import; returns without sleeping
+        cpu_usage = psutil.cpu_percent(interval=None)
         mem_usage = psutil.virtual_memory().percent
         ax4.bar(
             ['CPU', 'Memory'],
@@ -344,10 +400,10 @@ def create_performance_plots(df):
         ax4.set_ylim(0, 100)
         for i, v in enumerate([cpu_usage, mem_usage]):
             ax4.text(i, v + 2, f"{v:.1f}%", ha='center')
-        plt.tight_layout()
-        plt.savefig("benchmarks/performance_report.png",
+        fig.tight_layout()
+        fig.savefig("benchmarks/performance_report.png",
                     dpi=300, bbox_inches='tight')
-        plt.close()
+        plt.close(fig)
         logger.info("Generated comprehensive performance plots")
         return True
     except Exception as e:
@@ -446,12 +502,13 @@ def generate_pdf_report(df, validation_results):
             pdf.cell(col_widths[i], 8, col, border=1)
         pdf.ln()
         pdf.set_font('Arial', '', 8)
-        for _, row in df.iterrows():
-            for i, col in enumerate(cols):
-                if col in ["AvgTime", "P99", "P999"]:
-                    pdf.cell(col_widths[i], 8, f"{row[col]:.2f}", border=1)
-                else:
-                    pdf.cell(col_widths[i], 8, str(row[col]), border=1)
+        # Format every cell up front so the row loop only emits text
+        table = df[cols].astype(str)
+        for col in ["AvgTime", "P99", "P999"]:
+            table[col] = df[col].map("{:.2f}".format)
+        for row in table.itertuples(index=False, name=None):
+            for width, value in zip(col_widths, row):
+                pdf.cell(width, 8, value, border=1)
             pdf.ln()
         report_path = "benchmarks/benchmark_report.pdf"
         pdf.output(report_path)
@@ -482,8 +539,8 @@ def main():
         generate_pdf_report(benchmark_df, validation_results)
         duration = time.time() - start_time
         logger.info(
-            f"Benchmark completed in {duration:.2f}"
-            f"seconds. Final status: {'PASS' if passed else 'FAIL'}"
+            "Benchmark completed in %.2f seconds. Final status: %s",
+            duration, "PASS" if passed else "FAIL"
         )
         sys.exit(0 if passed else 1)
     except Exception as e:
@@ -2,7 +2,95 @@ import socket
 import time
 import argparse
 import ssl
-from typing import Tuple, Optional
+from typing import List, Optional, Tuple
+
+# Frames sent before their responses are read back. Small enough that
+# neither side's socket buffers fill while the other stops reading
+PIPELINE_WINDOW = 1000
+
+
+def _client_ssl_context(certfile: Optional[str]) -> ssl.SSLContext:
+    """Build the client-side TLS context, pinning certfile when given."""
+    context = ssl.create_default_context()
+    context.check_hostname = False
+    # Compression buys nothing for tiny frames; prefer AES-GCM suites,
+    # which run on hardware AES where available
+    context.options |= ssl.OP_NO_COMPRESSION
+    context.set_ciphers("ECDHE+AESGCM")
+
+    if certfile:
+        context.load_verify_locations(cafile=certfile)
+        context.verify_mode = ssl.CERT_REQUIRED
+    return context
+
+
+class QueryClient:
+    """Reusable connection that sends many queries over one socket.
+
+    Connecting (and the TLS handshake when ssl_mode is set) happens once,
+    so each query only costs a round trip on the open connection.
+    """
+
+    def __init__(
+        self,
+        host: str = "localhost",
+        port: int = 5555,
+        ssl_mode: bool = False,
+        certfile: str = None,
+        timeout: float = 5.0
+    ):
+        sock = socket.create_connection((host, port), timeout=timeout)
+        # Send small query frames immediately instead of waiting on Nagle
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        if ssl_mode:
+            try:
+                sock = _client_ssl_context(certfile).wrap_socket(
+                    sock, server_hostname=host)
+            except Exception:
+                sock.close()
+                raise
+        self.sock = sock
+        self._buffer = bytearray()
+        # Reused for every recv so reading allocates no new bytes objects
+        self._recv_view = memoryview(bytearray(1024))
+
+    def _read_response(self) -> str:
+        """Return the next newline-terminated response from the server."""
+        end = self._buffer.find(b"\n")
+        while end == -1:
+            received = self.sock.recv_into(self._recv_view)
+            if not received:
+                raise ConnectionError("Server closed the connection")
+            self._buffer += self._recv_view[:received]
+            end = self._buffer.find(b"\n")
+        response = self._buffer[:end].decode()
+        del self._buffer[:end + 1]
+        return response
+
+    def query(self, query: str) -> str:
+        """Send one query and wait for its response."""
+        self.sock.sendall(query.encode() + b"\x00")
+        return self._read_response()
+
+    def query_many(self, queries: List[str],
+                   window: int = PIPELINE_WINDOW) -> List[str]:
+        """Pipeline queries in windows of frames, reading each window back."""
+        responses = []
+        for start in range(0, len(queries), window):
+            batch = queries[start:start + window]
+            self.sock.sendall(
+                b"".join(query.encode() + b"\x00" for query in batch))
+            responses.extend(self._read_response() for _ in batch)
+        return responses
+
+    def close(self) -> None:
+        self.sock.close()
+
+    def __enter__(self) -> "QueryClient":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
 
 
 def query_server(
@@ -16,14 +104,10 @@ def query_server(
     try:
         with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
             sock.settimeout(timeout)
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
 
             if ssl_mode:
-                context = ssl.create_default_context()
-                context.check_hostname = False
-
-                if certfile:
-                    context.load_verify_locations(cafile=certfile)
-                    context.verify_mode = ssl.CERT_REQUIRED
+                context = _client_ssl_context(certfile)
 
                 try:
                     secure_sock = context.wrap_socket(
@@ -1,6 +1,15 @@
-import bisect
+import os
 import time
 import mmap
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+# Applications that use Searcher decide where its records go
+logger.addHandler(logging.NullHandler())
+
+# Read block size for files loaded without a memory mapping
+READ_BUFFER_SIZE = 512 * 1024
 
 
 class Searcher:
@@ -10,129 +19,204 @@ class Searcher:
         method: str = "linear",
         reread_on_query: bool = False,
         algorithm: str = None,
+        profile: bool = False,
+        data: list = None,
     ):
         self.path = path
         self.method = algorithm if algorithm else method
         self.reread_on_query = reread_on_query
+        self.profile = profile
         self.data = []
-        self.sorted_data = []
+        self.line_set = frozenset()
         self._mmap = None
-        self._file_handle = None
-
+        self._cache_key = None
+        # Serializes reloads; lookups read the current set without it
+        self._reload_lock = threading.Lock()
+
+        # Resolve the lookup once rather than branching on every query
+        self._lookup = (self.binary_search if self.method == "binary"
+                        else self.linear_search)
+
+        # Lines already parsed from this path (e.g. another searcher's
+        # .data) are reused as-is instead of reading the file again
+        if data is not None:
+            self._set_lines(data)
         # Memory mapping initialization
-        if not reread_on_query:
+        elif not reread_on_query:
             self._initialize_memory_mapping()
-            self.load_file()
+            try:
+                self.load_file()
+            finally:
+                # Lookups only touch the line set, never the mapping
+                self._release_memory_mapping()
 
     def _initialize_memory_mapping(self):
         """Initialize memory mapping for efficient file access."""
         try:
-            self._file_handle = open(self.path, 'rb')
-            self._mmap = mmap.mmap(
-                self._file_handle.fileno(), 0, access=mmap.ACCESS_READ)
+            # The mapping stays valid after its descriptor is closed
+            fd = os.open(self.path, os.O_RDONLY)
+            try:
+                self._mmap = mmap.mmap(fd, 0, access=mmap.ACCESS_READ)
+            finally:
+                os.close(fd)
+            self._advise_full_read()
         except Exception as e:
             # Fall back to regular file operations if mmap fails
-            print(
-                f"Memory mapping failed,"
-                f"falling back to regular file operations: {
-                    str(e)}")
+            logger.warning(
+                "Memory mapping failed, "
+                "falling back to regular file operations: %s", e)
+            self._mmap = None
+
+    def _advise_full_read(self):
+        """Ask the kernel to read ahead the whole mapping.
+
+        load_file copies the mapping once front to back, so readahead
+        replaces a page fault per page on a cold cache. The hints are
+        best-effort and skipped where the platform lacks them.
+        """
+        for advice in ("MADV_SEQUENTIAL", "MADV_WILLNEED"):
+            if hasattr(mmap, advice):
+                try:
+                    self._mmap.madvise(getattr(mmap, advice))
+                except OSError:
+                    pass
+
+    def _release_memory_mapping(self):
+        """Unmap the file so a later change to it cannot fault a reader."""
+        if self._mmap:
+            self._mmap.close()
             self._mmap = None
-            self._file_handle = None
 
     def load_file(self):
-        """Load file into self.data using optimized methods."""
+        """Load file into self.data as stripped, non-empty byte lines."""
         if self._mmap:
-            pos = 0
-            while pos < len(self._mmap):
-                # Directly call find on the mmap object
-                nl_pos = self._mmap.find(b'\n', pos)
-                if nl_pos == -1:
-                    nl_pos = len(self._mmap)
-                # Decode the bytes and strip all whitespace (not just newlines)
-                line = self._mmap[pos:nl_pos].decode('utf-8').strip()
-                if line:  # Only add non-empty lines
-                    self.data.append(line)
-                pos = nl_pos + 1
+            lines = self._split_lines(self._mmap[:])
         else:
             # Fallback to regular file operations with full stripping of
-            # whitespace
-            with open(self.path, "r", encoding="utf-8") as file:
-                self.data = [line.strip() for line in file if line.strip()]
-
-        if self.method == "binary":
-            self.sorted_data = sorted(self.data)
-
-            if self.method == "binary":
-                self.sorted_data = sorted(self.data)
-
-    def linear_search(self, query: str) -> bool:
-        """Optimized linear search with early termination."""
-        query = query.rstrip("\n")
-        return any(line == query for line in self.data)
-
-    def binary_search(self, query: str) -> bool:
-        """Optimized binary search with proper string handling."""
-        query = query.strip()
-        index = bisect.bisect_left(self.sorted_data, query)
-        return index != len(
-            self.sorted_data) and self.sorted_data[index] == query
-
-    def _search_with_reread(self, query: str) -> bool:
-        """Optimized file re-reading search."""
-        query = query.rstrip("\n")
+            # whitespace, reading in large blocks for files that cannot be
+            # mapped, such as pipes
+            with open(self.path, "r", encoding="utf-8",
+                      buffering=READ_BUFFER_SIZE) as file:
+                lines = [line.encode("utf-8")
+                         for line in map(str.strip, file) if line]
+        self._set_canonical_lines(lines)
+
+    def _read_file(self):
+        """Load the file with a plain read, as reread mode does on change."""
+        # No mapping: a file rewritten in place while being copied would
+        # fault a mapped reader
+        with open(self.path, "rb") as file:
+            self._set_canonical_lines(self._split_lines(file.read()))
+
+    @staticmethod
+    def _split_lines(raw: bytes) -> list:
+        """Split raw file bytes into stripped, non-empty lines."""
+        # splitlines finds line breaks in C and skips utf-8 decoding,
+        # matching the universal newlines of the text-mode fallback
+        return [line for line in map(bytes.strip, raw.splitlines()) if line]
+
+    def _set_canonical_lines(self, lines: list):
+        """Install lines with repeated ones sharing a single bytes object."""
+        canonical = {}
+        self._set_lines([canonical.setdefault(line, line) for line in lines])
+
+    def _set_lines(self, lines: list):
+        """Install stripped byte lines and the index built over them."""
+        self.data = lines
+        # Lines are stripped once, so membership needs no per-query work
+        self.line_set = frozenset(lines)
+
+    def linear_search(self, query: bytes) -> bool:
+        """Constant-time membership test against the pre-stripped line set."""
+        return query in self.line_set
+
+    def binary_search(self, query: bytes) -> bool:
+        """Equality lookup for the binary method via the hashed line set.
+
+        Queries only ever test equality, so a set probe replaces bisecting
+        a sorted copy of the data and the load no longer needs to sort.
+        """
+        return query.strip() in self.line_set
+
+    def _file_signature(self):
+        """Return a key that changes whenever the file is rewritten."""
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+    def _refresh(self):
+        """Reload the file if it changed since the last load."""
+        # A missing signature forces a reload so open() reports the error
+        key = self._file_signature()
+        if key is not None and key == self._cache_key:
+            return
+        with self._reload_lock:
+            # Threads that queued behind a reload of this same version
+            # find it already done
+            if key is None or key != self._cache_key:
+                self._read_file()
+                self._cache_key = key
+
+    def _search_with_reread(self, query: bytes) -> bool:
+        """Search the current file contents, reloading only on change."""
         if not query:
             return False
 
-        if self._mmap:
-            # Use memory mapping for re-reads
-            view = memoryview(self._mmap)
-            pos = 0
-            while pos < len(view):
-                nl_pos = view.find(b'\n', pos)
-                if nl_pos == -1:
-                    nl_pos = len(view)
-                line = view[pos:nl_pos].tobytes().decode('utf-8').rstrip('\n')
-                if line == query:
-                    return True
-                pos = nl_pos + 1
-            return False
-        else:
-            # Fallback to regular file reading
-            with open(self.path, "r", encoding="utf-8") as file:
-                if self.method == "binary":
-                    current_data = sorted(line.rstrip("\n")
-                                          for line in file
-                                          if line.rstrip("\n"))
-                    query = query.strip()
-                    index = bisect.bisect_left(current_data, query)
-                    return index != len(
-                        current_data) and current_data[index] == query
-                else:
-                    return any(line.rstrip("\n") == query for line in file)
-
-    def search(self, query: str) -> bool:
-        """Search for query using specified method with timing."""
-        query = query.rstrip("\n")
+        self._refresh()
+        return self._lookup(query)
+
+    def search(self, query: bytes | str) -> bool:
+        """Search for query using specified method.
+
+        Queries may be passed as raw bytes, as read off the socket, or as
+        str, which is encoded to utf-8 to match the stored lines.
+
+        Per-query timing is only measured and logged when profiling is
+        enabled, keeping the default path free of clock calls and I/O.
+        """
+        if isinstance(query, str):
+            query = query.encode("utf-8")
+        query = query.rstrip(b"\n")
         if not query:
             return False
 
-        start = time.perf_counter()
-
-        if self.reread_on_query:
-            result = self._search_with_reread(query)
-        else:
-            if self.method == "binary":
-                result = self.binary_search(query)
-            else:
-                result = self.linear_search(query)
+        lookup = (self._search_with_reread if self.reread_on_query
+                  else self._lookup)
+        if not self.profile:
+            return lookup(query)
 
-        end = time.perf_counter()
-        print(f"Search time: {(end - start) * 1000:.3f}ms")
+        start_ns = time.perf_counter_ns()
+        result = lookup(query)
+        elapsed_ns = time.perf_counter_ns() - start_ns
+        logger.debug("Search time: %.3fms", elapsed_ns / 1e6)
         return result
 
-    def __del__(self):
-        """Clean up resources."""
-        if self._mmap:
-            self._mmap.close()
-        if self._file_handle:
-            self._file_handle.close()
+    def search_many(self, queries) -> list:
+        """Search for every query in a batch, returning a list of results.
+
+        With reread_on_query enabled the file is checked, and reloaded if
+        needed, once for the whole batch rather than once per query.
+        """
+        if self.reread_on_query:
+            self._refresh()
+
+        lookup = self._lookup
+        results = []
+        for query in queries:
+            if isinstance(query, str):
+                query = query.encode("utf-8")
+            query = query.rstrip(b"\n")
+            results.append(bool(query) and lookup(query))
+        return results
+
+    def close(self):
+        """Release the file mapping, if one is still open."""
+        self._release_memory_mapping()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -2,6 +2,7 @@ import atexit
 import configparser
 import concurrent.futures
 import logging
+import multiprocessing
 import queue
 import signal
 import socket
@@ -9,11 +10,27 @@ import ssl
 import sys
 import threading
 import time
-from typing import Dict, Optional, Set, Tuple
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, List, Optional, Set, Tuple
 
 from search import Searcher
 from ssl_utils import create_ssl_context
 
+# Wire responses, one per query frame
+FOUND_RESPONSE = b"STRING EXISTS\n"
+NOT_FOUND_RESPONSE = b"STRING NOT FOUND\n"
+
+
+def _log_client_done(future: concurrent.futures.Future) -> None:
+    """Log how a client handler finished, without formatting at INFO."""
+    if not logging.getLogger().isEnabledFor(logging.DEBUG):
+        return
+    exc = future.exception()
+    if exc:
+        logging.debug("Client handling completed with %s", exc)
+    else:
+        logging.debug("Client handling completed successfully")
+
 
 class TCPServer:
     def __init__(self, max_workers: int = 10):
@@ -48,20 +65,65 @@ class TCPServer:
         self.key_file = self.config["SSL"]["keyfile"]
         self.ca_file = self.config.get("SSL", "cafile", fallback=None)
 
+        # Setup logging before the searcher, so warnings raised while
+        # loading the data file reach the server's handlers
+        self._start_logging()
+
+        # Several server processes can share the port, with the kernel
+        # balancing accepts between their listening sockets
+        self.processes = int(
+            self.config.get("SERVER", "processes", fallback=1))
+        self.reuse_port = (self.processes > 1
+                           and hasattr(socket, "SO_REUSEPORT"))
+        if self.processes > 1 and not self.reuse_port:
+            logging.warning(
+                "SO_REUSEPORT is not supported; ignoring processes=%d "
+                "and serving from a single process", self.processes)
+
         # Initialize searcher
         self.searcher = Searcher(
             self.file_path,
             reread_on_query=self.reread_on_query)
 
-        # Setup logging
-        logging.basicConfig(
-            level=logging.INFO,
-            format="%(asctime)s [%(levelname)s] [%(threadName)s] %(message)s",
-            handlers=[
-                logging.FileHandler("server.log"),
-                logging.StreamHandler(sys.stdout),
-            ],
-        )
+    def _start_logging(self) -> None:
+        """Route log records through a queue to a background writer thread.
+
+        Worker threads only enqueue records; formatting and the file and
+        console writes happen on the listener's thread. Logging the
+        application (or another server) already configured is left as is.
+        """
+        root = logging.getLogger()
+        if root.handlers:
+            self.log_handler = self.log_listener = None
+            return
+
+        formatter = logging.Formatter(
+            "%(asctime)s [%(levelname)s] [%(threadName)s] %(message)s")
+        handlers = [
+            logging.FileHandler("server.log"),
+            logging.StreamHandler(sys.stdout),
+        ]
+        for handler in handlers:
+            handler.setFormatter(formatter)
+
+        log_queue = queue.SimpleQueue()
+        self.log_handler = QueueHandler(log_queue)
+        self.log_listener = QueueListener(log_queue, *handlers)
+        # WARNING is the root logger's default, i.e. no level was chosen
+        if root.level == logging.WARNING:
+            root.setLevel(logging.INFO)
+        root.addHandler(self.log_handler)
+        self.log_listener.start()
+
+    def _stop_logging(self) -> None:
+        """Write out queued records and detach the queue handler."""
+        if self.log_listener is None:
+            return
+        logging.getLogger().removeHandler(self.log_handler)
+        self.log_listener.stop()
+        for handler in self.log_listener.handlers:
+            handler.close()
+        self.log_listener = None
 
     def _validate_config(self) -> None:
         """Validate the required configuration sections and options."""
@@ -79,18 +141,19 @@ class TCPServer:
         for section, options in required_sections.items():
             if not self.config.has_section(section):
                 logging.error(
-                    f"Missing required configuration section: {section}")
+                    "Missing required configuration section: %s", section)
                 sys.exit(1)
 
             for option in options:
                 if not self.config.has_option(section, option):
                     logging.error(
-                        f"Missing required option "
-                        f"'{option}' in section '{section}'")
+                        "Missing required option '%s' in section '%s'",
+                        option, section)
                     sys.exit(1)
 
     def _update_connection_stats(
-            self, address: Tuple[str, int], duration: float) -> None:
+            self, address: Tuple[str, int], duration: float,
+            queries: int = 1) -> None:
         """Thread-safe update of connection statistics."""
         with self.lock:
             if address not in self.connection_stats:
@@ -99,7 +162,7 @@ class TCPServer:
                     'total_time': 0.0,
                     'last_connected': time.time()
                 }
-            self.connection_stats[address]['count'] += 1
+            self.connection_stats[address]['count'] += queries
             self.connection_stats[address]['total_time'] += duration
             self.connection_stats[address]['last_connected'] = time.time()
 
@@ -107,95 +170,129 @@ class TCPServer:
                       address: Tuple[str, int]) -> None:
         """Handle client connection and search requests."""
         thread_name = threading.current_thread().name
-        logging.info(f"[{thread_name}] Handling connection from {address}")
+        logging.info("[%s] Handling connection from %s", thread_name, address)
 
         try:
             with self.lock:
                 self.active_connections.add(conn)
 
+            # Send short responses at once instead of waiting on Nagle
+            conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
             conn.settimeout(1.0)
-            buffer = b""
+            # Reuse one receive chunk and grow the frame buffer in place
+            chunk = bytearray(4096)
+            chunk_view = memoryview(chunk)
+            buffer = bytearray()
             total_queries = 0
 
             while not self.shutdown_flag:
                 try:
-                    data = conn.recv(1024)
-                    if not data:
+                    received = conn.recv_into(chunk)
+                    if not received:
                         break
 
-                    buffer += data
-                    if b"\x00" in buffer:
-                        query_part, _, buffer = buffer.partition(b"\x00")
-                        try:
-                            query = query_part.decode("utf-8").strip()
-                            start_time = time.perf_counter()
-                            exists = self.searcher.search(query)
-                            end_time = time.perf_counter()
-
-                            duration_ms = (end_time - start_time) * 1000
-                            total_queries += 1
-                            self._update_connection_stats(address, duration_ms)
-
-                            if duration_ms > self.max_allowed_time_ms:
-                                logging.warning(
-                                    f"[{thread_name}]"
-                                    f" Slow query from {address}: "
-                                    f"'{query[:20]}...' took "
-                                    f"{duration_ms:.2f}ms "
-                                    f"(limit "
-                                    f"{self.max_allowed_time_ms}ms)"
-                                )
-
-                            response = ("STRING EXISTS\n"
-                                        if exists else "STRING NOT FOUND\n")
-                            conn.sendall(response.encode())
-
-                            logging.info(
-                                f"[{thread_name}] "
-                                f"Query='{query[:20]}...' from {address[0]} "
-                                f"Result={'FOUND'
-                                          if exists else 'NOT FOUND'} "
-                                f"({duration_ms:.2f}ms)"
-                            )
-
-                        except UnicodeDecodeError:
-                            logging.warning(
-                                f"[{thread_name}] "
-                                f"Invalid UTF-8 from {address}")
-                            conn.sendall(b"STRING NOT FOUND\n")
+                    # Only the new bytes can hold the next terminator
+                    scan_from = len(buffer)
+                    buffer += chunk_view[:received]
+                    start = 0
+                    frames = []
+                    # Collect every complete frame for pipelined queries
+                    while (end := buffer.find(b"\x00", scan_from)) != -1:
+                        # Strip once, after copying out of the buffer
+                        frames.append(bytes(buffer[start:end]).strip())
+                        start = scan_from = end + 1
+
+                    if frames:
+                        # Drop answered frames, keeping any partial query
+                        del buffer[:start]
+                        total_queries += self._answer_queries(
+                            conn, address, frames)
 
                 except socket.timeout:
                     continue
                 except ssl.SSLError as e:
                     logging.error(
-                        f"[{thread_name}] SSL error with {address}: {e}")
+                        "[%s] SSL error with %s: %s", thread_name, address, e)
                     break
         except (ConnectionResetError, BrokenPipeError) as e:
             logging.warning(
-                f"[{thread_name}] Client {address} disconnected: {e}")
+                "[%s] Client %s disconnected: %s", thread_name, address, e)
         except Exception as e:
             logging.exception(
-                f"[{thread_name}] Unexpected error with {address}: {e}")
+                "[%s] Unexpected error with %s: %s", thread_name, address, e)
         finally:
             try:
                 conn.shutdown(socket.SHUT_RDWR)
                 conn.close()
             except Exception as e:
-                logging.debug(f"[{thread_name}] "
-                              f"Connection close error: {e}")
+                logging.debug("[%s] Connection close error: %s",
+                              thread_name, e)
             finally:
                 with self.lock:
                     self.active_connections.discard(conn)
-                logging.info(f"[{thread_name}] "
-                             f"Closed connection from {address} "
-                             f"(processed {total_queries} queries)")
+                logging.info("[%s] Closed connection from %s "
+                             "(processed %d queries)",
+                             thread_name, address, total_queries)
+
+    def _answer_queries(self, conn: socket.socket, address: Tuple[str, int],
+                        frames: List[bytes]) -> int:
+        """Answer a batch of frames with one search and one send."""
+        thread_name = threading.current_thread().name
+        queries = []
+        for frame in frames:
+            try:
+                # Search on the raw bytes; the decoded text only
+                # validates the frame and feeds the log lines
+                queries.append(frame.decode("utf-8"))
+            except UnicodeDecodeError:
+                logging.warning(
+                    "[%s] Invalid UTF-8 from %s", thread_name, address)
+                queries.append(None)
+
+        valid = [frame for frame, query in zip(frames, queries)
+                 if query is not None]
+        start_ns = time.perf_counter_ns()
+        results = iter(self.searcher.search_many(valid))
+        elapsed_ms = (time.perf_counter_ns() - start_ns) / 1e6
+
+        responses = []
+        for query in queries:
+            if query is None:
+                responses.append(NOT_FOUND_RESPONSE)
+                continue
+
+            exists = next(results)
+            responses.append(FOUND_RESPONSE if exists else NOT_FOUND_RESPONSE)
+
+            # %-style args are only formatted, and the
+            # query only truncated, if the record is emitted
+            logging.info(
+                "[%s] Query='%.20s...' from %s Result=%s (%.2fms)",
+                thread_name, query, address[0],
+                "FOUND" if exists else "NOT FOUND",
+                elapsed_ms
+            )
+
+        if valid:
+            self._update_connection_stats(address, elapsed_ms, len(valid))
+            if elapsed_ms > self.max_allowed_time_ms:
+                logging.warning(
+                    "[%s] Slow batch of %d queries from %s starting "
+                    "'%.20s...' took %.2fms (limit %dms)",
+                    thread_name, len(valid), address,
+                    next(query for query in queries if query is not None),
+                    elapsed_ms, self.max_allowed_time_ms
+                )
+
+        conn.sendall(b"".join(responses))
+        return len(valid)
 
     def start(self) -> None:
         """Start the TCP server with thread pool management."""
         if threading.current_thread() == threading.main_thread():
             def handler(signum, frame) -> None:
                 logging.info(
-                    f"Received signal {signum}, initiating shutdown...")
+                    "Received signal %s, initiating shutdown...", signum)
                 self.shutdown_flag = True
 
             signal.signal(signal.SIGINT, handler)
@@ -203,6 +300,8 @@ class TCPServer:
 
         sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        if self.reuse_port:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
         sock.bind(("", self.port))
         sock.listen(100)  # Increased backlog
         sock.settimeout(1.0)
@@ -214,13 +313,12 @@ class TCPServer:
                     self.cert_file, self.key_file, self.ca_file)
                 logging.info("SSL enabled with certificate verification")
             except ssl.SSLError as e:
-                logging.error(f"SSL setup failed: {e}")
+                logging.error("SSL setup failed: %s", e)
                 sys.exit(1)
 
         logging.info(
-            f"Server started on port {
-                self.port} with {
-                self.thread_pool._max_workers} worker threads")
+            "Server started on port %d with %d worker threads",
+            self.port, self.thread_pool._max_workers)
         atexit.register(self.cleanup, sock)
 
         try:
@@ -239,35 +337,32 @@ class TCPServer:
                                 cert = conn.getpeercert()
                                 if not cert:
                                     logging.error(
-                                        f"No client certificate"
-                                        f" provided from {addr}")
+                                        "No client certificate "
+                                        "provided from %s", addr)
                                     conn.close()
                                     continue
                         except ssl.SSLError as e:
                             logging.error(
-                                f"SSL handshake failed with {addr}: {e}")
+                                "SSL handshake failed with %s: %s", addr, e)
                             conn.close()
                             continue
 
                     future = self.thread_pool.submit(
                         self.handle_client, conn, addr)
-                    future.add_done_callback(
-                        lambda f: logging.debug(
-                            f"Client handling completed with {f.exception()}"
-                            if f.exception() else "Client"
-                            " handling completed successfully"
-                        )
-                    )
+                    future.add_done_callback(_log_client_done)
                 except socket.timeout:
                     continue
                 except ssl.SSLError as e:
-                    logging.error(f"SSL error: {e}")
+                    logging.error("SSL error: %s", e)
                 except OSError as e:
                     if not self.shutdown_flag:
-                        logging.error(f"Socket error: {e}")
+                        logging.error("Socket error: %s", e)
         except KeyboardInterrupt:
             logging.info("Received keyboard interrupt, shutting down...")
         finally:
+            # Already cleaned up here; a second run at exit would log
+            # after the log listener has stopped
+            atexit.unregister(self.cleanup)
             self.cleanup(sock)
 
     def cleanup(self, sock: Optional[socket.socket] = None) -> None:
@@ -278,6 +373,9 @@ class TCPServer:
         # Shutdown thread pool first
         self.thread_pool.shutdown(wait=True, cancel_futures=False)
 
+        # No worker can be searching once the pool has drained
+        self.searcher.close()
+
         # Close all active connections
         with self.lock:
             connections = list(self.active_connections)
@@ -286,7 +384,7 @@ class TCPServer:
                     conn.shutdown(socket.SHUT_RDWR)
                     conn.close()
                 except Exception as e:
-                    logging.debug(f"Connection close error: {e}")
+                    logging.debug("Connection close error: %s", e)
                 finally:
                     self.active_connections.discard(conn)
 
@@ -295,7 +393,7 @@ class TCPServer:
             try:
                 sock.close()
             except Exception as e:
-                logging.debug(f"Socket close error: {e}")
+                logging.debug("Socket close error: %s", e)
 
         # Log connection statistics
         logging.info("Connection statistics:")
@@ -303,13 +401,53 @@ class TCPServer:
             avg_time = stats['total_time'] / \
                 stats['count'] if stats['count'] > 0 else 0
             logging.info(
-                f"  {addr[0]}:{addr[1]} - "
-                f"Queries: {stats['count']}, "
-                f"Avg Time: {avg_time:.2f}ms, "
-                f"Last: {time.ctime(stats['last_connected'])}"
+                "  %s:%s - Queries: %d, Avg Time: %.2fms, Last: %s",
+                addr[0], addr[1], stats['count'], avg_time,
+                time.ctime(stats['last_connected'])
             )
 
         logging.info("Server shutdown complete")
+        self._stop_logging()
+
+
+def _serve_forked(server: TCPServer) -> None:
+    """Entry point of a forked server process."""
+    server._start_logging()
+    server.start()
+
+
+def run_processes(server: TCPServer) -> None:
+    """Serve from several forked processes bound to the same port.
+
+    The server, and the searcher data it holds, are built once before
+    forking, so every worker process starts from copy-on-write pages.
+    """
+    context = multiprocessing.get_context("fork")
+    workers = [
+        context.Process(target=_serve_forked, args=(server,),
+                        name=f"TCPServer-{i}")
+        for i in range(server.processes)
+    ]
+    # The log listener thread does not survive a fork, so each process
+    # starts its own
+    server._stop_logging()
+    for worker in workers:
+        worker.start()
+    server._start_logging()
+    logging.info("Started %d server processes on port %d",
+                 server.processes, server.port)
+
+    def handler(signum, frame) -> None:
+        logging.info("Received signal %s, stopping workers...", signum)
+        for worker in workers:
+            worker.terminate()
+
+    signal.signal(signal.SIGINT, handler)
+    signal.signal(signal.SIGTERM, handler)
+
+    for worker in workers:
+        worker.join()
+    server._stop_logging()
 
 
 def main() -> None:
@@ -321,8 +459,12 @@ def main() -> None:
 
     server = TCPServer(max_workers=max_workers)
 
+    if server.reuse_port:
+        run_processes(server)
+        return
+
     def handler(signum, frame) -> None:
-        logging.info(f"Received signal {signum}")
+        logging.info("Received signal %s", signum)
         server.shutdown_flag = True
 
     signal.signal(signal.SIGINT, handler)
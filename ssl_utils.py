@@ -4,12 +4,28 @@ SSL Context Management
 import os
 import ssl
 import datetime
-from typing import Optional
+import functools
+from typing import Optional, Tuple
 from cryptography import x509
 from cryptography.hazmat.backends import default_backend
 import errno
 
 
+@functools.lru_cache(maxsize=8)
+def _certificate_validity(
+        certfile: str,
+        mtime_ns: int) -> Tuple[datetime.datetime, datetime.datetime]:
+    """Parse a PEM certificate once per file version.
+
+    The modification time is part of the cache key, so a replaced
+    certificate is parsed again.
+    """
+    with open(certfile, "rb") as f:
+        cert_data = f.read()
+    cert = x509.load_pem_x509_certificate(cert_data, default_backend())
+    return cert.not_valid_before_utc, cert.not_valid_after_utc
+
+
 def create_ssl_context(
         certfile: str,
         keyfile: str,
@@ -34,12 +50,11 @@ def create_ssl_context(
             errno.ENOENT, os.strerror(
                 errno.ENOENT), keyfile)
 
-    # Check expiration manually
-    with open(certfile, "rb") as f:
-        cert_data = f.read()
-    cert = x509.load_pem_x509_certificate(cert_data, default_backend())
-    now = datetime.datetime.utcnow()
-    if cert.not_valid_before > now or cert.not_valid_after < now:
+    # Check expiration manually against the cached validity window
+    not_before, not_after = _certificate_validity(
+        certfile, os.stat(certfile).st_mtime_ns)
+    now = datetime.datetime.now(datetime.timezone.utc)
+    if not_before > now or not_after < now:
         raise ssl.SSLError("Certificate is expired or not yet valid.")
 
     # SSL context setup
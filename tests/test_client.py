@@ -0,0 +1,102 @@
+import os
+import socket
+import sys
+import threading
+
+import pytest
+
+# Add project directory to sys.path for local imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from client import QueryClient  # noqa: E402
+
+
+KNOWN = {b"7;0;6;28;0;23;5;0;", b"1;2;3"}
+
+
+def fake_server(sock):
+    """Answer \\x00-framed queries the way TCPServer does."""
+    buffer = b""
+    with sock:
+        while True:
+            data = sock.recv(1024)
+            if not data:
+                break
+            buffer += data
+            while b"\x00" in buffer:
+                query, _, buffer = buffer.partition(b"\x00")
+                sock.sendall(b"STRING EXISTS\n" if query in KNOWN
+                             else b"STRING NOT FOUND\n")
+
+
+@pytest.fixture
+def server_port():
+    """Serve one connection on a loopback port with fake_server."""
+    listener = socket.create_server(("127.0.0.1", 0))
+
+    def accept_one():
+        with listener:
+            conn, _ = listener.accept()
+            fake_server(conn)
+
+    server = threading.Thread(target=accept_one)
+    server.start()
+    yield listener.getsockname()[1]
+    server.join(timeout=2)
+
+
+@pytest.fixture
+def client(server_port):
+    with QueryClient(port=server_port) as query_client:
+        yield query_client
+
+
+def test_query_reuses_connection(client):
+    assert client.query("7;0;6;28;0;23;5;0;") == "STRING EXISTS"
+    assert client.query("missing") == "STRING NOT FOUND"
+    assert client.query("1;2;3") == "STRING EXISTS"
+
+
+def test_query_many_pipelines_frames(client):
+    responses = client.query_many(["1;2;3", "missing", "7;0;6;28;0;23;5;0;"])
+    assert responses == ["STRING EXISTS", "STRING NOT FOUND",
+                         "STRING EXISTS"]
+
+
+def test_query_many_larger_than_socket_buffers():
+    listener = socket.create_server(("127.0.0.1", 0))
+    # Small buffers on both ends, so sending the whole batch before
+    # reading any response would fill them and stall both sides
+    for option in (socket.SO_SNDBUF, socket.SO_RCVBUF):
+        listener.setsockopt(socket.SOL_SOCKET, option, 4096)
+
+    def accept_one():
+        with listener:
+            conn, _ = listener.accept()
+            conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            fake_server(conn)
+
+    server = threading.Thread(target=accept_one)
+    server.start()
+    queries = ["1;2;3", "missing"] * 50_000
+    with QueryClient(port=listener.getsockname()[1], timeout=2) as client:
+        for option in (socket.SO_SNDBUF, socket.SO_RCVBUF):
+            client.sock.setsockopt(socket.SOL_SOCKET, option, 4096)
+        responses = client.query_many(queries)
+    server.join(timeout=2)
+    assert len(responses) == len(queries)
+    assert responses[:2] == ["STRING EXISTS", "STRING NOT FOUND"]
+    assert responses[-2:] == ["STRING EXISTS", "STRING NOT FOUND"]
+
+
+def test_client_disables_nagle(client):
+    assert client.sock.getsockopt(
+        socket.IPPROTO_TCP, socket.TCP_NODELAY) != 0
+
+
+def test_server_disconnect_raises():
+    listener = socket.create_server(("127.0.0.1", 0))
+    with listener, QueryClient(port=listener.getsockname()[1]) as client:
+        listener.accept()[0].close()
+        with pytest.raises((ConnectionError, OSError)):
+            client.query("anything")
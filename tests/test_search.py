@@ -1,5 +1,7 @@
+import logging
 import os
 import sys
+import threading
 from unittest.mock import mock_open, patch
 
 import pytest
@@ -113,14 +115,125 @@ def test_file_permission_error():
 
 # Parameter and Configuration Tests
 def test_reread_on_query():
-    with patch("builtins.open", mock_open(read_data=TEST_FILE_CONTENT)):
+    with patch("builtins.open",
+               mock_open(read_data=TEST_FILE_CONTENT.encode())):
         searcher = Searcher("dummy.txt", reread_on_query=True)
         assert searcher.search("1;2;3") is True
         # Verify it rereads by changing mock data
-        with patch("builtins.open", mock_open(read_data="new_content")):
+        with patch("builtins.open", mock_open(read_data=b"new_content")):
             assert searcher.search("new_content") is True
 
 
+def test_reread_on_query_reloads_changed_file(sample_data_file):
+    searcher = Searcher(sample_data_file, reread_on_query=True)
+    with patch.object(searcher, "_read_file",
+                      wraps=searcher._read_file) as load:
+        assert searcher.search("1;2;3") is True
+        assert searcher.search("7;0;6;28;0;23;5;0;") is True
+        assert load.call_count == 1  # unchanged file is not re-parsed
+
+        with open(sample_data_file, "w") as f:
+            f.write("replaced_line\n")
+        assert searcher.search("replaced_line") is True
+        assert searcher.search("1;2;3") is False
+        assert load.call_count == 2
+
+
+def test_concurrent_reread_reloads_once(sample_data_file):
+    searcher = Searcher(sample_data_file, reread_on_query=True)
+    assert searcher.search("1;2;3") is True
+    with open(sample_data_file, "w") as f:
+        f.write("replaced_line\n")
+
+    results = []
+    with patch.object(searcher, "_read_file",
+                      wraps=searcher._read_file) as load:
+        threads = [
+            threading.Thread(
+                target=lambda: results.append(
+                    searcher.search("replaced_line")))
+            for _ in range(8)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+    assert results == [True] * 8
+    assert load.call_count == 1  # one thread rebuilds, the rest reuse it
+
+
+def test_reread_does_not_map_the_file(sample_data_file):
+    searcher = Searcher(sample_data_file, reread_on_query=True)
+    # A mapped copy of a file truncated mid-read would raise SIGBUS
+    with patch("search.mmap.mmap") as mapping:
+        assert searcher.search("1;2;3") is True
+        with open(sample_data_file, "w") as f:
+            f.write("replaced_line\n")
+        assert searcher.search("replaced_line") is True
+    mapping.assert_not_called()
+
+
+@pytest.mark.parametrize("algorithm", ["linear", "binary"])
+def test_search_many(sample_data_file, algorithm):
+    searcher = Searcher(sample_data_file, algorithm=algorithm,
+                        reread_on_query=True)
+    with patch.object(searcher, "_file_signature",
+                      wraps=searcher._file_signature) as signature:
+        results = searcher.search_many(
+            ["1;2;3", "nonexistent", "", "10;0;1;26;0;8;3;0;\n"])
+    assert results == [True, False, False, True]
+    assert signature.call_count == 1  # one freshness check per batch
+
+
+@pytest.mark.parametrize("algorithm", ["linear", "binary"])
+def test_bytes_queries(sample_data_file, algorithm):
+    searcher = Searcher(sample_data_file, algorithm=algorithm)
+    assert searcher.search(b"1;2;3") is True
+    assert searcher.search(b"1;2;3\n") is True
+    assert searcher.search(b"nonexistent") is False
+    assert searcher.search_many([b"1;2;3", "1;2;3", b""]) == [
+        True, True, False]
+
+
+def test_mixed_line_endings(tmp_path):
+    test_file = tmp_path / "line_endings.txt"
+    test_file.write_bytes(b"unix\nwindows\r\nclassic_mac\rlast")
+    searcher = Searcher(str(test_file))
+    assert searcher.data == [b"unix", b"windows", b"classic_mac", b"last"]
+    assert searcher.search("classic_mac") is True
+
+
+def test_duplicate_lines_share_one_object(tmp_path):
+    test_file = tmp_path / "duplicates.txt"
+    test_file.write_text("repeat\nother\nrepeat\n  repeat  \n")
+    searcher = Searcher(str(test_file))
+    assert searcher.data == [b"repeat", b"other", b"repeat", b"repeat"]
+    assert searcher.data[0] is searcher.data[2] is searcher.data[3]
+
+
+def test_mapping_released_after_load(sample_data_file):
+    searcher = Searcher(sample_data_file)
+    assert searcher._mmap is None  # lookups never read the mapping
+    assert searcher.search("1;2;3") is True
+
+
+def test_context_manager_closes_mapping(sample_data_file):
+    with Searcher(sample_data_file, reread_on_query=True) as searcher:
+        searcher._initialize_memory_mapping()
+        assert searcher._mmap is not None
+    assert searcher._mmap is None
+    searcher.close()  # closing twice is harmless
+
+
+def test_preloaded_data_skips_file_read(sample_data_file):
+    first = Searcher(sample_data_file)
+    with patch("builtins.open", side_effect=AssertionError("file re-read")):
+        second = Searcher(sample_data_file, algorithm="binary",
+                          data=first.data)
+        assert second.search("1;2;3") is True
+        assert second.search("nonexistent") is False
+
+
 def test_algorithm_parameter_precedence():
     with patch("builtins.open", mock_open(read_data=TEST_FILE_CONTENT)):
         searcher = Searcher("dummy.txt", method="linear", algorithm="binary")
@@ -128,12 +241,29 @@ def test_algorithm_parameter_precedence():
 
 
 # Performance Tests (basic verification)
-def test_search_timing_output(capsys):
+def test_search_timing_output(caplog):
+    with patch("builtins.open", mock_open(read_data=TEST_FILE_CONTENT)):
+        searcher = Searcher("dummy.txt", profile=True)
+        with caplog.at_level(logging.DEBUG, logger="search"):
+            searcher.search("1;2;3")
+        assert "Search time:" in caplog.text
+
+
+def test_search_is_silent_without_profile(caplog):
     with patch("builtins.open", mock_open(read_data=TEST_FILE_CONTENT)):
         searcher = Searcher("dummy.txt")
-        searcher.search("1;2;3")
-        captured = capsys.readouterr()
-        assert "Search time:" in captured.out
+        with caplog.at_level(logging.DEBUG, logger="search"):
+            assert searcher.search("1;2;3") is True
+        assert "Search time:" not in caplog.text
+
+
+def test_mapping_failure_is_logged(caplog, capsys):
+    with patch("builtins.open", mock_open(read_data=TEST_FILE_CONTENT)):
+        with caplog.at_level(logging.WARNING, logger="search"):
+            searcher = Searcher("dummy.txt")
+        assert searcher.search("1;2;3") is True
+    assert "Memory mapping failed" in caplog.text
+    assert capsys.readouterr().out == ""
 
 
 def test_unicode_handling():
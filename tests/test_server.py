@@ -3,6 +3,7 @@ import datetime
 import logging
 import socket
 import threading
+import time
 from unittest.mock import MagicMock, mock_open, patch
 
 import pytest
@@ -12,7 +13,7 @@ from cryptography.hazmat.primitives import hashes, serialization
 from cryptography.hazmat.primitives.asymmetric import rsa
 from cryptography.x509.oid import NameOID
 
-from server import TCPServer
+from server import TCPServer, run_processes
 
 
 MOCK_CONFIG = {
@@ -101,7 +102,8 @@ def temp_cert_key(tmp_path):
 @pytest.fixture
 def test_server():
     """Fixture providing a test server instance."""
-    with patch("builtins.open", mock_open(read_data=TEST_DATA)):
+    # The mocked config enables reread mode, which reads the file as bytes
+    with patch("builtins.open", mock_open(read_data=TEST_DATA.encode())):
         server = TCPServer()
         server.shutdown_flag = False
         yield server
@@ -111,11 +113,25 @@ def test_server():
 # Rest of your test functions remain the same...
 
 
+def feed(mock_conn, chunks):
+    """Make mock_conn.recv_into deliver chunks in order, raising errors."""
+    items = iter(chunks)
+
+    def recv_into(buffer, *args):
+        chunk = next(items)
+        if isinstance(chunk, BaseException):
+            raise chunk
+        buffer[:len(chunk)] = chunk
+        return len(chunk)
+
+    mock_conn.recv_into.side_effect = recv_into
+
+
 def test_handle_client_normal_query(test_server, caplog):
     """Test handling of a normal client query."""
     caplog.set_level(logging.INFO)
     mock_conn = MagicMock()
-    mock_conn.recv.side_effect = [b"7;0;6;28;0;23;5;0;\x00", b""]
+    feed(mock_conn, [b"7;0;6;28;0;23;5;0;\x00", b""])
     test_server.handle_client(mock_conn, ("127.0.0.1", 12345))
     mock_conn.sendall.assert_called_once_with(b"STRING EXISTS\n")
     logs = caplog.text
@@ -128,7 +144,7 @@ def test_handle_client_not_found(test_server, caplog):
     """Test handling of a not found query."""
     caplog.set_level(logging.INFO)
     mock_conn = MagicMock()
-    mock_conn.recv.side_effect = [b"nonexistent_string\x00", b""]
+    feed(mock_conn, [b"nonexistent_string\x00", b""])
     test_server.handle_client(mock_conn, ("127.0.0.1", 12345))
     mock_conn.sendall.assert_called_once_with(b"STRING NOT FOUND\n")
     assert "Result=NOT FOUND" in caplog.text
@@ -138,9 +154,9 @@ def test_handle_client_not_found(test_server, caplog):
 def test_client_timeout_handling(test_server):
     """Test handling of client timeout."""
     mock_conn = MagicMock()
-    mock_conn.recv.side_effect = [socket.timeout(), socket.timeout(), b""]
+    feed(mock_conn, [socket.timeout(), socket.timeout(), b""])
     test_server.handle_client(mock_conn, ("127.0.0.1", 12345))
-    assert mock_conn.recv.call_count == 3
+    assert mock_conn.recv_into.call_count == 3
     assert mock_conn.close.call_count == 1
     assert not mock_conn.sendall.called
 
@@ -148,23 +164,78 @@ def test_client_timeout_handling(test_server):
 def test_client_disconnect_during_query(test_server):
     """Test handling of client disconnection."""
     mock_conn = MagicMock()
-    mock_conn.recv.side_effect = ConnectionResetError()
+    mock_conn.recv_into.side_effect = ConnectionResetError()
     test_server.handle_client(mock_conn, ("127.0.0.1", 12345))
     mock_conn.close.assert_called_once()
 
 
+def test_nagle_disabled_on_client_socket(test_server):
+    """Test that responses are not delayed by Nagle's algorithm."""
+    mock_conn = MagicMock()
+    feed(mock_conn, [b""])
+    test_server.handle_client(mock_conn, ("127.0.0.1", 12345))
+    mock_conn.setsockopt.assert_any_call(
+        socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+
 def test_multiple_packets_received(test_server):
     """Test handling of multiple packet reception."""
     mock_conn = MagicMock()
-    mock_conn.recv.side_effect = [b"7;0;6;28", b";0;23;5;0;\x00", b""]
+    feed(mock_conn, [b"7;0;6;28", b";0;23;5;0;\x00", b""])
     test_server.handle_client(mock_conn, ("127.0.0.1", 12345))
     mock_conn.sendall.assert_called_once_with(b"STRING EXISTS\n")
 
 
+def test_pipelined_queries_in_one_packet(test_server):
+    """Test that frames from one recv are answered as a single batch."""
+    mock_conn = MagicMock()
+    feed(mock_conn, [
+        b"7;0;6;28;0;23;5;0;\x00\xff\xfe\x00nonexistent\x00", b""])
+    with patch.object(test_server.searcher, "search_many",
+                      wraps=test_server.searcher.search_many) as search:
+        test_server.handle_client(mock_conn, ("127.0.0.1", 12345))
+    search.assert_called_once_with([b"7;0;6;28;0;23;5;0;", b"nonexistent"])
+    mock_conn.sendall.assert_called_once_with(
+        b"STRING EXISTS\nSTRING NOT FOUND\nSTRING NOT FOUND\n")
+
+
+def test_slow_batch_warns_once_with_elapsed_time(test_server, caplog):
+    """Test that a batch slower than the limit is reported as a whole."""
+    def slow_search_many(queries):
+        time.sleep(0.15)
+        return [False] * len(queries)
+
+    test_server.max_allowed_time_ms = 100
+    mock_conn = MagicMock()
+    feed(mock_conn, [b"query\x00" * 10, b""])
+    with patch.object(test_server.searcher, "search_many",
+                      side_effect=slow_search_many):
+        test_server.handle_client(mock_conn, ("127.0.0.1", 12345))
+    warnings = [r.getMessage() for r in caplog.records
+                if r.levelno == logging.WARNING]
+    assert len(warnings) == 1
+    assert "Slow batch of 10 queries" in warnings[0]
+    assert "'query...'" in warnings[0]
+    stats = test_server.connection_stats[("127.0.0.1", 12345)]
+    assert stats["count"] == 10
+    # The batch is recorded once, so the average stays per query
+    assert 15 <= stats["total_time"] / stats["count"] < 100
+
+
+def test_frame_split_across_packets_with_trailing_partial(test_server):
+    """Test that a partial frame is kept until its terminator arrives."""
+    mock_conn = MagicMock()
+    feed(mock_conn, [
+        b"7;0;", b"6;28;0;23;", b"5;0;\x00none", b"xistent\x00", b""])
+    test_server.handle_client(mock_conn, ("127.0.0.1", 12345))
+    assert [c.args[0] for c in mock_conn.sendall.call_args_list] == [
+        b"STRING EXISTS\n", b"STRING NOT FOUND\n"]
+
+
 def test_empty_query(test_server):
     """Test handling of empty queries."""
     mock_conn = MagicMock()
-    mock_conn.recv.side_effect = [b"\x00", b""]
+    feed(mock_conn, [b"\x00", b""])
     test_server.handle_client(mock_conn, ("127.0.0.1", 12345))
     mock_conn.sendall.assert_called_once_with(b"STRING NOT FOUND\n")
 
@@ -173,8 +244,8 @@ def test_multiple_simultaneous_connections(test_server):
     """Test handling of multiple simultaneous connections."""
     mock_conn1 = MagicMock()
     mock_conn2 = MagicMock()
-    mock_conn1.recv.side_effect = [b"query1\x00", b""]
-    mock_conn2.recv.side_effect = [b"query2\x00", b""]
+    feed(mock_conn1, [b"query1\x00", b""])
+    feed(mock_conn2, [b"query2\x00", b""])
 
     thread1 = threading.Thread(
         target=test_server.handle_client,
@@ -193,6 +264,108 @@ def test_multiple_simultaneous_connections(test_server):
     assert mock_conn2.sendall.called
 
 
+@pytest.mark.skipif(not hasattr(socket, "SO_REUSEPORT"),
+                    reason="SO_REUSEPORT not supported")
+def test_reuse_port_enabled_for_multiple_processes():
+    """Test that several server processes share the port."""
+    # RawConfigParser is not patched by the mock_config fixture
+    config = configparser.RawConfigParser()
+    config.read_dict(MOCK_CONFIG)
+    config["SERVER"]["processes"] = "2"
+    with patch("configparser.ConfigParser", return_value=config), \
+            patch.object(config, "read"), \
+            patch("builtins.open", mock_open(read_data=TEST_DATA)):
+        server = TCPServer()
+    assert server.processes == 2
+    assert server.reuse_port is True
+    server.cleanup(MagicMock())
+
+
+def test_reuse_port_unsupported_is_reported(monkeypatch, caplog):
+    """Test that asking for processes without SO_REUSEPORT is logged."""
+    monkeypatch.delattr(socket, "SO_REUSEPORT", raising=False)
+    config = configparser.RawConfigParser()
+    config.read_dict(MOCK_CONFIG)
+    config["SERVER"]["processes"] = "2"
+    with patch("configparser.ConfigParser", return_value=config), \
+            patch.object(config, "read"), \
+            patch("builtins.open", mock_open(read_data=TEST_DATA)):
+        server = TCPServer()
+    assert server.reuse_port is False
+    assert "SO_REUSEPORT is not supported" in caplog.text
+    server.cleanup(MagicMock())
+
+
+def test_run_processes_stops_log_listener():
+    """Test that the parent drains its log queue once the workers exit."""
+    with patch.object(logging.getLogger(), "handlers", []), \
+            patch("builtins.open", mock_open(read_data=TEST_DATA)):
+        server = TCPServer()
+        server.processes = 2
+        with patch("server.multiprocessing.get_context") as get_context, \
+                patch("server.signal.signal"):
+            run_processes(server)
+        workers = get_context.return_value.Process.return_value
+        assert workers.join.call_count == 2
+        assert server.log_listener is None
+        assert logging.getLogger().handlers == []
+        server.cleanup(MagicMock())
+
+
+def test_reuse_port_disabled_by_default(test_server):
+    """Test that a single server process keeps exclusive use of the port."""
+    assert test_server.reuse_port is False
+
+
+def test_cleanup_stops_log_listener():
+    """Test that cleanup drains the log queue and detaches its handler."""
+    root = logging.getLogger()
+    with patch.object(root, "handlers", []), \
+            patch("builtins.open", mock_open(read_data=TEST_DATA)):
+        server = TCPServer()
+        handler = server.log_handler
+        assert root.handlers == [handler]
+        server.cleanup(MagicMock())
+        assert root.handlers == []
+    assert server.log_listener is None
+
+
+def test_existing_logging_setup_is_kept():
+    """Test that a second server neither duplicates handlers nor levels."""
+    root = logging.getLogger()
+    level = root.level
+    root.setLevel(logging.ERROR)
+    try:
+        with patch.object(root, "handlers", []), \
+                patch("builtins.open", mock_open(read_data=TEST_DATA)):
+            first = TCPServer()
+            second = TCPServer()
+            assert root.handlers == [first.log_handler]
+            assert second.log_listener is None
+            assert root.level == logging.ERROR
+            second.cleanup(MagicMock())
+            first.cleanup(MagicMock())
+    finally:
+        root.setLevel(level)
+
+
+def test_mapping_failure_reaches_server_log(tmp_path, capsys):
+    """Test that data file warnings at startup go to the server's output."""
+    empty_file = tmp_path / "empty.txt"
+    empty_file.write_text("")  # an empty file cannot be memory mapped
+    config = configparser.RawConfigParser()
+    config.read_dict(MOCK_CONFIG)
+    config["PATHS"]["linuxpath"] = str(empty_file)
+    # Start from a root logger without handlers, as in a fresh process
+    with patch.object(logging.getLogger(), "handlers", []), \
+            patch("configparser.ConfigParser", return_value=config), \
+            patch.object(config, "read"), \
+            patch("builtins.open", mock_open(read_data=TEST_DATA)):
+        server = TCPServer()
+        server.cleanup(MagicMock())
+    assert "Memory mapping failed" in capsys.readouterr().out
+
+
 def test_cleanup_with_active_connections(test_server):
     """Test cleanup with active connections."""
     mock_conn = MagicMock()
@@ -205,7 +378,7 @@ def test_high_connection_load(test_server):
     """Test server under concurrent load."""
     def mock_client(query):
         mock_conn = MagicMock()
-        mock_conn.recv.side_effect = [query.encode() + b"\x00", b""]
+        feed(mock_conn, [query.encode() + b"\x00", b""])
         test_server.handle_client(mock_conn, ("127.0.0.1", 12345))
         return mock_conn
 
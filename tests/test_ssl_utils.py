@@ -5,6 +5,7 @@ import sys
 import tempfile
 from pathlib import Path
 from typing import Tuple
+from unittest.mock import patch
 
 import pytest
 from cryptography import x509
@@ -15,6 +16,7 @@ from cryptography.x509.oid import NameOID
 
 # Fix path for local imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import ssl_utils  # noqa: E402
 from ssl_utils import create_ssl_context  # noqa: E402
 
 
@@ -228,3 +230,44 @@ class TestSSLUtils:
         finally:
             Path(cert_path).unlink(missing_ok=True)
             Path(key_path).unlink(missing_ok=True)
+
+    def test_certificate_parse_is_cached(self, rsa_key_pair, tmp_path):
+        """Test that an unchanged certificate is only parsed once."""
+        _, private_key_pem = rsa_key_pair
+        key = serialization.load_pem_private_key(
+            private_key_pem.encode(),
+            password=None,
+            backend=default_backend()
+        )
+        name = x509.Name([
+            x509.NameAttribute(NameOID.COMMON_NAME, "localhost"),
+        ])
+        now = datetime.datetime.now(datetime.timezone.utc)
+        cert = (
+            x509.CertificateBuilder()
+            .subject_name(name)
+            .issuer_name(name)
+            .public_key(key.public_key())
+            .serial_number(x509.random_serial_number())
+            .not_valid_before(now - datetime.timedelta(days=1))
+            .not_valid_after(now + datetime.timedelta(days=1))
+            .sign(key, hashes.SHA256(), default_backend())
+        )
+        cert_path = tmp_path / "cert.pem"
+        key_path = tmp_path / "key.pem"
+        cert_path.write_bytes(cert.public_bytes(serialization.Encoding.PEM))
+        key_path.write_text(private_key_pem)
+
+        ssl_utils._certificate_validity.cache_clear()
+        with patch.object(ssl_utils.x509, "load_pem_x509_certificate",
+                          wraps=x509.load_pem_x509_certificate) as load:
+            create_ssl_context(str(cert_path), str(key_path))
+            create_ssl_context(str(cert_path), str(key_path))
+            assert load.call_count == 1
+
+            # A rewritten certificate file is parsed again
+            stat = os.stat(cert_path)
+            os.utime(cert_path, ns=(stat.st_atime_ns,
+                                    stat.st_mtime_ns + 1_000_000_000))
+            create_ssl_context(str(cert_path), str(key_path))
+            assert load.call_count == 2